@@ -0,0 +1,8 @@
+#!/bin/bash
+# Optional: AOT-compile the tessie_api helpers with mypyc for CPython
+# deployments that run the package in tight loops. The Cloudflare Workers
+# runtime cannot load C extensions, so the shipped package stays pure
+# Python and this is strictly an opt-in local build.
+
+python3 -m pip install mypy
+python3 -m mypyc tessie_api/tessie_wrapper.py tessie_api/fake_api.py
@@ -1,10 +1,21 @@
+import asyncio
+import base64
+import hashlib
+import hmac
 import json
+import time
 from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qsl, urlparse
 
+import aiohttp
 import jwt
 from aiohttp import ClientSession
 
+try:  # ~5x faster than stdlib parse_qs on short query strings
+    from fast_query_parsers import parse_query_string as _parse_query_pairs_fast
+except ImportError:  # pragma: no cover - optional accelerator
+    _parse_query_pairs_fast = None
+
 try:  # Cloudflare Workers runtime provides Response
     from cloudflare_workers import Response
 except ImportError:  # pragma: no cover - local testing fallback
@@ -17,6 +28,39 @@ except ImportError:  # pragma: no cover - local testing fallback
 
 from tessie_api import get_state, set_charge_limit, start_charging, wake
 
+# Upstream HTTP session shared across requests for the lifetime of the Worker
+# isolate. Creating a ClientSession per request pays a fresh TCP+TLS handshake
+# to api.tessie.com every time; reusing one keeps connections warm.
+_SESSION: Optional[ClientSession] = None
+_SESSION_LOCK = asyncio.Lock()
+
+
+async def _get_session() -> ClientSession:
+    """Return the shared upstream session, creating it lazily."""
+
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        async with _SESSION_LOCK:
+            if _SESSION is None or _SESSION.closed:
+                _SESSION = ClientSession(
+                    connector=aiohttp.TCPConnector(
+                        limit=100,
+                        ttl_dns_cache=300,
+                        keepalive_timeout=75,
+                    ),
+                    timeout=aiohttp.ClientTimeout(total=30),
+                )
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared session. Intended for isolate shutdown and tests."""
+
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
 
 class HTTPException(Exception):
     """Exception used to provide HTTP-specific metadata."""
@@ -27,6 +71,80 @@ class HTTPException(Exception):
         self.message = message
 
 
+# Verified tokens keyed by the raw token string. Clients reuse the same JWT
+# for many requests, so re-running HMAC verification per request is wasted
+# CPU; entries live for at most five seconds (clamped to the token's exp).
+_JWT_CACHE: Dict[str, float] = {}
+_JWT_CACHE_TTL = 5.0
+_JWT_CACHE_MAX_ENTRIES = 1024
+
+# Header layouts produced by common HS256 encoders (PyJWT emits the first).
+# Tokens with any other header fall back to PyJWT's full decode path.
+_EXPECTED_JWT_HEADERS = (
+    b'{"alg":"HS256","typ":"JWT"}',
+    b'{"typ":"JWT","alg":"HS256"}',
+)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _verify_hs256(token: str, secret: str) -> Optional[Dict[str, Any]]:
+    """Verify an HS256 token without PyJWT's per-call options plumbing.
+
+    Returns the payload dict on success, or None when the token does not fit
+    the fast path and PyJWT should decide. Raises HTTPException(403) on a
+    definitive signature mismatch or expiry.
+    """
+
+    try:
+        header_b64, payload_b64, signature_b64 = token.split(".")
+        if _b64url_decode(header_b64) not in _EXPECTED_JWT_HEADERS:
+            return None
+        signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
+        digest = hmac.new(secret.encode(), signing_input, hashlib.sha256).digest()
+        if not hmac.compare_digest(digest, _b64url_decode(signature_b64)):
+            raise HTTPException(403, "Invalid token")
+        payload = json.loads(_b64url_decode(payload_b64))
+    except HTTPException:
+        raise
+    except Exception:
+        # Malformed token; let PyJWT produce the canonical error.
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+
+    if "aud" in payload:
+        # Audience validation has PyJWT-specific semantics (rejects tokens
+        # carrying aud unless the caller opts in); defer to the full decode.
+        return None
+
+    now = time.time()
+    exp_claim = payload.get("exp")
+    if exp_claim is not None:
+        if not isinstance(exp_claim, (int, float)):
+            # PyJWT rejects non-numeric exp; let it produce that error.
+            return None
+        if now >= exp_claim:
+            raise HTTPException(403, "Invalid token")
+
+    nbf_claim = payload.get("nbf")
+    if nbf_claim is not None:
+        if not isinstance(nbf_claim, (int, float)):
+            return None
+        if now < nbf_claim:
+            raise HTTPException(403, "Invalid token")
+
+    iat_claim = payload.get("iat")
+    if iat_claim is not None and not isinstance(iat_claim, (int, float)):
+        # PyJWT raises InvalidIssuedAtError for non-numeric iat.
+        return None
+
+    return payload
+
+
 async def _authorize_request(request, env) -> None:
     """Validate Authorization header and JWT token."""
 
@@ -42,29 +160,57 @@ async def _authorize_request(request, env) -> None:
     if not jwt_secret:
         raise HTTPException(500, "JWT secret is not configured")
 
-    try:
-        jwt.decode(token, jwt_secret, algorithms=["HS256"])
-    except jwt.PyJWTError as exc:
-        raise HTTPException(403, "Invalid token") from exc
+    now = time.time()
+    cached_until = _JWT_CACHE.get(token)
+    if cached_until is not None and now < cached_until:
+        return
+
+    payload = _verify_hs256(token, jwt_secret)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, jwt_secret, algorithms=["HS256"])
+        except jwt.PyJWTError as exc:
+            raise HTTPException(403, "Invalid token") from exc
+
+    # Only successfully verified tokens enter the cache, and never beyond
+    # their own expiry.
+    expires_at = now + _JWT_CACHE_TTL
+    exp_claim = payload.get("exp")
+    if isinstance(exp_claim, (int, float)):
+        expires_at = min(expires_at, float(exp_claim))
+
+    if len(_JWT_CACHE) >= _JWT_CACHE_MAX_ENTRIES:
+        _JWT_CACHE.pop(next(iter(_JWT_CACHE)))
+    _JWT_CACHE[token] = expires_at
+
+
+def _query_value(query: str, name: str) -> Optional[str]:
+    """Scan the query string for a single parameter without building a dict."""
+
+    if not query:
+        return None
+
+    if _parse_query_pairs_fast is not None:
+        pairs = _parse_query_pairs_fast(query.encode(), "&")
+    else:
+        pairs = parse_qsl(query)
 
+    for key, value in pairs:
+        if key == name:
+            return value
+    return None
 
-def _extract_vin(params: Dict[str, Any]) -> str:
-    vin = params.get("vin")
-    if isinstance(vin, list):
-        vin = vin[0]
+
+def _extract_vin(query: str, body: Optional[Dict[str, Any]]) -> str:
+    vin = body.get("vin") if body else None
+    if vin is None:
+        vin = _query_value(query, "vin")
     if not isinstance(vin, str) or not vin:
         raise HTTPException(400, "Missing required 'vin' parameter")
     return vin
 
 
-async def _parse_request_data(request) -> Dict[str, Any]:
-    if request.method.upper() == "GET":
-        parsed = urlparse(str(request.url))
-        return {
-            key: values if len(values) > 1 else values[0]
-            for key, values in parse_qs(parsed.query).items()
-        }
-
+async def _parse_json_body(request) -> Dict[str, Any]:
     if request.headers.get("Content-Type", "").startswith("application/json"):
         try:
             body = await request.json()
@@ -77,33 +223,43 @@ async def _parse_request_data(request) -> Dict[str, Any]:
     raise HTTPException(400, "Unsupported content type")
 
 
+# Shared headers dict and pre-serialized bodies for the static responses, so
+# common misses skip json.dumps and a headers-dict allocation entirely.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_NOT_FOUND_BODY = json.dumps({"error": "Not Found"})
+_INTERNAL_ERROR_BODY = json.dumps({"error": "Internal Server Error"})
+_TESSIE_KEY_MISSING_BODY = json.dumps({"error": "Tessie API key is not configured"})
+
+
 def _json_response(data: Any, status: int = 200):
     body = json.dumps(data)
-    return Response(body, status=status, headers={"Content-Type": "application/json"})
+    return Response(body, status=status, headers=_JSON_HEADERS)
 
 
 def _error_response(exc: HTTPException):
     return _json_response({"error": exc.message}, status=exc.status)
 
 
-async def _handle_status(session: ClientSession, tessie_key: str, params: Dict[str, Any]):
-    vin = _extract_vin(params)
+async def _handle_status(session: ClientSession, tessie_key: str, query: str, body: Optional[Dict[str, Any]]):
+    vin = _extract_vin(query, body)
     return await get_state(session=session, api_key=tessie_key, vin=vin)
 
 
-async def _handle_wake(session: ClientSession, tessie_key: str, params: Dict[str, Any]):
-    vin = _extract_vin(params)
+async def _handle_wake(session: ClientSession, tessie_key: str, query: str, body: Optional[Dict[str, Any]]):
+    vin = _extract_vin(query, body)
     return await wake(session=session, api_key=tessie_key, vin=vin)
 
 
-async def _handle_start_charging(session: ClientSession, tessie_key: str, params: Dict[str, Any]):
-    vin = _extract_vin(params)
+async def _handle_start_charging(session: ClientSession, tessie_key: str, query: str, body: Optional[Dict[str, Any]]):
+    vin = _extract_vin(query, body)
     return await start_charging(session=session, api_key=tessie_key, vin=vin)
 
 
-async def _handle_set_charge_limit(session: ClientSession, tessie_key: str, params: Dict[str, Any]):
-    vin = _extract_vin(params)
-    percent = params.get("percent")
+async def _handle_set_charge_limit(session: ClientSession, tessie_key: str, query: str, body: Optional[Dict[str, Any]]):
+    vin = _extract_vin(query, body)
+    percent = body.get("percent") if body else None
+    if percent is None:
+        percent = _query_value(query, "percent")
     if percent is None:
         raise HTTPException(400, "Missing required 'percent' parameter")
     try:
@@ -119,37 +275,55 @@ async def _handle_set_charge_limit(session: ClientSession, tessie_key: str, para
     )
 
 
-async def fetch(request, env, ctx):  # noqa: D401 - Cloudflare entry point
-    parsed_url = urlparse(str(request.url))
+# API routes that require authentication and custom handling, mapped to
+# (handler, needs_body). Built once at import time; fetch() only does a dict
+# lookup per request. Routes with needs_body=False take everything they need
+# from the URL, so their requests skip JSON body deserialization unless the
+# caller actually sent a JSON body.
+_RouteHandler = Callable[[ClientSession, str, str, Optional[Dict[str, Any]]], Awaitable[Any]]
+_ROUTES: Dict[Tuple[str, str], Tuple[_RouteHandler, bool]] = {
+    ("GET", "/status"): (_handle_status, False),
+    ("POST", "/wake"): (_handle_wake, False),
+    ("POST", "/command/start_charging"): (_handle_start_charging, False),
+    ("POST", "/command/set_charge_limit"): (_handle_set_charge_limit, True),
+}
 
-    # Define API routes that require authentication and custom handling
-    api_routes: Dict[Tuple[str, str], Callable[[ClientSession, str, Dict[str, Any]], Awaitable[Any]]] = {
-        ("GET", "/status"): _handle_status,
-        ("POST", "/wake"): _handle_wake,
-        ("POST", "/command/start_charging"): _handle_start_charging,
-        ("POST", "/command/set_charge_limit"): _handle_set_charge_limit,
-    }
 
-    route_key = (request.method.upper(), parsed_url.path)
-    route_handler = api_routes.get(route_key)
+async def fetch(request, env, ctx):  # noqa: D401 - Cloudflare entry point
+    parsed_url = urlparse(str(request.url))
 
-    # If this is an API route, handle it with authentication and custom logic
-    if route_handler:
+    # The Workers runtime always delivers request.method uppercase, so the
+    # common path skips .upper(); mixed-case methods from local harnesses
+    # still resolve through the fallback.
+    method = request.method
+    route = _ROUTES.get((method, parsed_url.path))
+    if route is None and not method.isupper():
+        method = method.upper()
+        route = _ROUTES.get((method, parsed_url.path))
+
+    # If this is an API route, handle it with authentication and custom logic.
+    # Authorization runs before any body I/O so bad tokens fail fast.
+    if route:
+        route_handler, needs_body = route
         await _authorize_request(request, env)
 
         tessie_key = getattr(env, "TESSIE_API_KEY", None)
         if not tessie_key:
-            return _json_response({"error": "Tessie API key is not configured"}, status=500)
+            return Response(_TESSIE_KEY_MISSING_BODY, status=500, headers=_JSON_HEADERS)
 
         try:
-            params = await _parse_request_data(request)
-            async with ClientSession() as session:
-                result = await route_handler(session, tessie_key, params)
+            body = None
+            if method != "GET":
+                content_type = request.headers.get("Content-Type", "")
+                if needs_body or content_type.startswith("application/json"):
+                    body = await _parse_json_body(request)
+            session = await _get_session()
+            result = await route_handler(session, tessie_key, parsed_url.query, body)
         except HTTPException as exc:
             return _error_response(exc)
         except Exception as e:  # pragma: no cover - catch-all for worker stability
             print(f"An unexpected error occurred: {e}") # consider using a proper logger here
-            return _json_response({"error": "Internal Server Error"}, status=500)
+            return Response(_INTERNAL_ERROR_BODY, status=500, headers=_JSON_HEADERS)
 
         return _json_response(result)
 
@@ -160,4 +334,4 @@ async def fetch(request, env, ctx):  # noqa: D401 - Cloudflare entry point
         return await assets_binding.fetch(request)
 
     # Fallback if no assets binding is configured
-    return _json_response({"error": "Not Found"}, status=404)
+    return Response(_NOT_FOUND_BODY, status=404, headers=_JSON_HEADERS)
@@ -1,322 +1,499 @@
-"""
-Cloudflare Python Worker for Tessie APIs
-
-Unified worker providing access to:
-- Tessie REST API (/api/tessie/*)
-- Teslemetry API (/api/telemetry/*)
-- Tesla Fleet API (/api/fleet/*)
-
-Plus health checks, diagnostics, and status endpoints.
-"""
-
-import json
-import os
-from typing import Any, Dict, Optional
-from urllib.parse import parse_qs, urlparse
-
-try:
-    from cloudflare_workers import Response
-except ImportError:
-    # Local testing fallback
-    class Response:
-        def __init__(self, body: str = "", status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
-            self.body = body
-            self.status = status
-            self.headers = headers or {}
-
-
-from tessie_client import UnifiedTessieClient, TessieAPIError
-from utils.health import HealthChecker
-
-
-class HTTPException(Exception):
-    """HTTP exception with status code"""
-
-    def __init__(self, status: int, message: str) -> None:
-        super().__init__(message)
-        self.status = status
-        self.message = message
-
-
-def _json_response(data: Any, status: int = 200) -> Response:
-    """Create JSON response"""
-    body = json.dumps(data, indent=2)
-    return Response(body, status=status, headers={"Content-Type": "application/json"})
-
-
-def _error_response(status: int, message: str) -> Response:
-    """Create error response"""
-    return _json_response({"error": message}, status=status)
-
-
-def _parse_query_params(url: str) -> Dict[str, Any]:
-    """Parse query parameters from URL"""
-    parsed = urlparse(url)
-    params = parse_qs(parsed.query)
-    return {k: v[0] if len(v) == 1 else v for k, v in params.items()}
-
-
-async def _parse_json_body(request) -> Dict[str, Any]:
-    """Parse JSON request body"""
-    try:
-        if request.headers.get("Content-Type", "").startswith("application/json"):
-            return await request.json()
-        return {}
-    except Exception as e:
-        raise HTTPException(400, f"Invalid JSON body: {str(e)}")
-
-
-def _extract_path_suffix(full_path: str, prefix: str) -> str:
-    """Extract path suffix after prefix"""
-    if full_path.startswith(prefix):
-        return full_path[len(prefix):].lstrip("/")
-    return ""
-
-
-async def fetch(request, env, ctx):
-    """
-    Main Cloudflare Worker entry point
-
-    Routes:
-        GET  /health          - Unified health check for all APIs
-        GET  /status          - Detailed status including auth validation
-        GET  /api/tessie/*    - Tessie REST API proxy
-        GET  /api/telemetry/* - Teslemetry API proxy
-        GET  /api/fleet/*     - Tesla Fleet API proxy
-        *    *                - Static assets from ASSETS binding
-    """
-
-    parsed_url = urlparse(str(request.url))
-    path = parsed_url.path
-    method = request.method.upper()
-
-    # Initialize unified client from environment variables
-    tessie_token = getattr(env, "TESSIE_API_KEY", os.getenv("TESSIE_API_KEY"))
-    telemetry_token = getattr(env, "TESLEMETRY_API_KEY", os.getenv("TESLEMETRY_API_KEY"))
-    fleet_token = getattr(env, "FLEET_API_KEY", os.getenv("FLEET_API_KEY"))
-    fleet_region = getattr(env, "FLEET_REGION", os.getenv("FLEET_REGION", "na"))
-
-    client = UnifiedTessieClient(
-        tessie_token=tessie_token,
-        telemetry_token=telemetry_token,
-        fleet_token=fleet_token,
-        fleet_region=fleet_region
-    )
-
-    try:
-        # ========== Health and Status Endpoints ==========
-
-        if path == "/health" and method == "GET":
-            """Unified health check for all APIs"""
-            health_checker = HealthChecker(client)
-            result = await health_checker.check_all()
-            await client.close()
-            return _json_response(result)
-
-        if path == "/status" and method == "GET":
-            """Detailed status including auth validation"""
-            health_checker = HealthChecker(client)
-            health_result = await health_checker.check_all()
-            auth_result = await health_checker.check_auth()
-            await client.close()
-
-            return _json_response({
-                "health": health_result,
-                "authentication": auth_result,
-                "configuration": {
-                    "tessie_configured": tessie_token is not None,
-                    "telemetry_configured": telemetry_token is not None,
-                    "fleet_configured": fleet_token is not None,
-                    "fleet_region": fleet_region
-                }
-            })
-
-        # ========== Tessie REST API Routes ==========
-
-        if path.startswith("/api/tessie/"):
-            if not client.tessie:
-                await client.close()
-                return _error_response(503, "Tessie API not configured")
-
-            endpoint = _extract_path_suffix(path, "/api/tessie")
-            params = _parse_query_params(str(request.url))
-            json_body = await _parse_json_body(request) if method in ["POST", "PUT", "PATCH"] else None
-
-            try:
-                # Route to appropriate Tessie client method
-                if endpoint == "vehicles":
-                    only_active = params.get("only_active", "true").lower() == "true"
-                    result = await client.tessie.list_vehicles(only_active=only_active)
-
-                elif endpoint.endswith("/state"):
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.state(vin)
-
-                elif endpoint.endswith("/battery"):
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.battery(vin)
-
-                elif endpoint.endswith("/wake") and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.wake(vin)
-
-                elif "/command/start_charging" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.start_charging(vin)
-
-                elif "/command/stop_charging" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.stop_charging(vin)
-
-                elif "/command/set_charge_limit" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    percent = json_body.get("percent") if json_body else None
-                    if percent is None:
-                        raise HTTPException(400, "Missing 'percent' parameter")
-                    result = await client.tessie.set_charge_limit(vin, int(percent))
-
-                elif "/command/lock" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.lock(vin)
-
-                elif "/command/unlock" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.unlock(vin)
-
-                elif "/command/flash_lights" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.flash_lights(vin)
-
-                elif "/command/honk" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.honk(vin)
-
-                elif "/command/start_climate" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.start_climate(vin)
-
-                elif "/command/stop_climate" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.tessie.stop_climate(vin)
-
-                else:
-                    await client.close()
-                    return _error_response(404, f"Tessie endpoint not found: {endpoint}")
-
-                await client.close()
-                return _json_response(result)
-
-            except TessieAPIError as e:
-                await client.close()
-                return _error_response(e.status_code or 500, e.message)
-
-        # ========== Teslemetry API Routes ==========
-
-        if path.startswith("/api/telemetry/"):
-            if not client.telemetry:
-                await client.close()
-                return _error_response(503, "Teslemetry API not configured")
-
-            endpoint = _extract_path_suffix(path, "/api/telemetry")
-            params = _parse_query_params(str(request.url))
-
-            try:
-                if endpoint == "ping":
-                    result = await client.telemetry.ping()
-
-                elif endpoint == "test":
-                    result = await client.telemetry.test()
-
-                elif endpoint == "metadata":
-                    result = await client.telemetry.metadata()
-
-                elif endpoint == "scopes":
-                    result = await client.telemetry.scopes()
-
-                elif "/polling" in endpoint:
-                    vin = endpoint.split("/")[1]
-                    enabled_param = params.get("enabled")
-
-                    if enabled_param is None and method == "GET":
-                        result = await client.telemetry.server_side_polling(vin, None)
-                    elif enabled_param == "true" or method == "POST":
-                        result = await client.telemetry.server_side_polling(vin, True)
-                    elif enabled_param == "false" or method == "DELETE":
-                        result = await client.telemetry.server_side_polling(vin, False)
-                    else:
-                        raise HTTPException(400, "Invalid polling operation")
-
-                elif "/refresh" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[1]
-                    result = await client.telemetry.vehicle_data_refresh(vin)
-
-                else:
-                    await client.close()
-                    return _error_response(404, f"Teslemetry endpoint not found: {endpoint}")
-
-                await client.close()
-                return _json_response(result)
-
-            except TessieAPIError as e:
-                await client.close()
-                return _error_response(e.status_code or 500, e.message)
-
-        # ========== Tesla Fleet API Routes ==========
-
-        if path.startswith("/api/fleet/"):
-            if not client.fleet:
-                await client.close()
-                return _error_response(503, "Tesla Fleet API not configured")
-
-            endpoint = _extract_path_suffix(path, "/api/fleet")
-            params = _parse_query_params(str(request.url))
-            json_body = await _parse_json_body(request) if method in ["POST", "PUT", "PATCH"] else None
-
-            try:
-                if endpoint == "vehicles":
-                    result = await client.fleet.list_vehicles()
-
-                elif "/vehicle_data" in endpoint:
-                    vin = endpoint.split("/")[0]
-                    endpoints_param = params.get("endpoints")
-                    result = await client.fleet.vehicle_data(vin, endpoints_param)
-
-                elif "/wake_up" in endpoint and method == "POST":
-                    vin = endpoint.split("/")[0]
-                    result = await client.fleet.wake_up(vin)
-
-                elif "/command/" in endpoint and method == "POST":
-                    parts = endpoint.split("/command/")
-                    vin = parts[0]
-                    command = parts[1]
-                    result = await client.fleet.command(vin, command, json_body)
-
-                else:
-                    await client.close()
-                    return _error_response(404, f"Fleet endpoint not found: {endpoint}")
-
-                await client.close()
-                return _json_response(result)
-
-            except TessieAPIError as e:
-                await client.close()
-                return _error_response(e.status_code or 500, e.message)
-
-        # ========== Static Assets Fallback ==========
-
-        assets_binding = getattr(env, "ASSETS", None)
-        if assets_binding:
-            await client.close()
-            return await assets_binding.fetch(request)
-
-        await client.close()
-        return _error_response(404, "Not Found")
-
-    except HTTPException as e:
-        await client.close()
-        return _error_response(e.status, e.message)
-
-    except Exception as e:
-        await client.close()
-        print(f"Unexpected error: {str(e)}")
-        return _error_response(500, f"Internal Server Error: {str(e)}")
+"""
+Cloudflare Python Worker for Tessie APIs
+
+Unified worker providing access to:
+- Tessie REST API (/api/tessie/*)
+- Teslemetry API (/api/telemetry/*)
+- Tesla Fleet API (/api/fleet/*)
+
+Plus health checks, diagnostics, and status endpoints.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlparse
+
+try:  # ~5x faster than stdlib parse_qs on short query strings
+    from fast_query_parsers import parse_query_string as _parse_query_pairs_fast
+except ImportError:  # Optional accelerator
+    _parse_query_pairs_fast = None
+
+try:  # C-accelerated encoder returning bytes, skipping the str->bytes pass
+    import orjson
+except ImportError:  # Optional accelerator
+    orjson = None
+
+try:
+    from cloudflare_workers import Response
+except ImportError:
+    # Local testing fallback
+    class Response:
+        def __init__(self, body: "str | bytes" = b"", status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+            self.body = body
+            self.status = status
+            self.headers = headers or {}
+
+
+from tessie_client import UnifiedTessieClient, TessieAPIError
+from utils.health import HealthChecker
+
+
+class HTTPException(Exception):
+    """HTTP exception with status code"""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Compact separators keep the encoder on the C-accelerated path and roughly
+# halve the bytes on the wire compared to indent=2. Pretty output is still
+# available on /health and /status via ?pretty=1.
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def _dumps(data: Any):
+    """Serialize to compact JSON, as bytes when orjson is available.
+
+    orjson returns bytes directly, so the runtime skips a str->bytes encode
+    pass when writing the response body.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=_COMPACT_SEPARATORS)
+
+
+# Shared headers dict and pre-serialized bodies for static responses, so the
+# common 404 path skips serialization and a headers-dict allocation.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_NOT_FOUND_BODY = _dumps({"error": "Not Found"})
+
+
+def _wants_pretty(query: str) -> bool:
+    """Return True when the request opts into indented JSON output."""
+    return "pretty=1" in query or "pretty=true" in query
+
+
+def _json_response(data: Any, status: int = 200) -> Response:
+    """Create JSON response"""
+    return Response(_dumps(data), status=status, headers=_JSON_HEADERS)
+
+
+def _error_response(status: int, message: str) -> Response:
+    """Create error response"""
+    return _json_response({"error": message}, status=status)
+
+
+def _parse_query_params(query: str) -> Dict[str, Any]:
+    """Parse an already-extracted query string into a params dict"""
+    if not query:
+        return {}
+
+    if _parse_query_pairs_fast is not None:
+        pairs = _parse_query_pairs_fast(query.encode(), "&")
+    else:
+        pairs = parse_qsl(query)
+
+    params: Dict[str, Any] = {}
+    for k, v in pairs:
+        existing = params.get(k)
+        if existing is None:
+            params[k] = v
+        elif isinstance(existing, list):
+            existing.append(v)
+        else:
+            params[k] = [existing, v]
+    return params
+
+
+async def _parse_json_body(request) -> Dict[str, Any]:
+    """Parse JSON request body"""
+    try:
+        if request.headers.get("Content-Type", "").startswith("application/json"):
+            return await request.json()
+        return {}
+    except Exception as e:
+        raise HTTPException(400, f"Invalid JSON body: {str(e)}")
+
+
+def _extract_path_suffix(full_path: str, prefix: str) -> str:
+    """Extract path suffix after prefix"""
+    if full_path.startswith(prefix):
+        return full_path[len(prefix):].lstrip("/")
+    return ""
+
+
+# Dispatch tables mapping the path segment after the VIN to client method
+# names. Built once at import time so routing is a dict lookup instead of a
+# chain of substring scans per request.
+_TESSIE_VIN_ROUTES: Dict[str, str] = {
+    "state": "state",
+    "battery": "battery",
+}
+
+_TESSIE_VIN_COMMANDS: Dict[str, str] = {
+    "wake": "wake",
+    "command/start_charging": "start_charging",
+    "command/stop_charging": "stop_charging",
+    "command/lock": "lock",
+    "command/unlock": "unlock",
+    "command/flash_lights": "flash_lights",
+    "command/honk": "honk",
+    "command/start_climate": "start_climate",
+    "command/stop_climate": "stop_climate",
+}
+
+_TELEMETRY_ROUTES: Dict[str, str] = {
+    "ping": "ping",
+    "test": "test",
+    "metadata": "metadata",
+    "scopes": "scopes",
+}
+
+
+async def _handle_tessie(client: UnifiedTessieClient, endpoint: str, method: str,
+                         params: Dict[str, Any], json_body: Optional[Dict[str, Any]]) -> Response:
+    """Handle /api/tessie/* requests"""
+    if not client.tessie:
+        return _error_response(503, "Tessie API not configured")
+
+    try:
+        # Route to appropriate Tessie client method
+        if endpoint == "vehicles":
+            only_active = params.get("only_active", "true").lower() == "true"
+            result = await client.tessie.list_vehicles(only_active=only_active)
+
+        else:
+            # partition returns a 3-tuple without allocating a list.
+            vin, _, op = endpoint.partition("/")
+
+            if op == "command/set_charge_limit" and method == "POST":
+                percent = json_body.get("percent") if json_body else None
+                if percent is None:
+                    raise HTTPException(400, "Missing 'percent' parameter")
+                result = await client.tessie.set_charge_limit(vin, int(percent))
+
+            elif op in _TESSIE_VIN_ROUTES:
+                result = await getattr(client.tessie, _TESSIE_VIN_ROUTES[op])(vin)
+
+            elif op in _TESSIE_VIN_COMMANDS and method == "POST":
+                result = await getattr(client.tessie, _TESSIE_VIN_COMMANDS[op])(vin)
+
+            else:
+                return _error_response(404, f"Tessie endpoint not found: {endpoint}")
+
+        return _json_response(result)
+
+    except TessieAPIError as e:
+        return _error_response(e.status_code or 500, e.message)
+
+
+async def _handle_telemetry(client: UnifiedTessieClient, endpoint: str, method: str,
+                            params: Dict[str, Any], json_body: Optional[Dict[str, Any]]) -> Response:
+    """Handle /api/telemetry/* requests"""
+    if not client.telemetry:
+        return _error_response(503, "Teslemetry API not configured")
+
+    try:
+        if endpoint in _TELEMETRY_ROUTES:
+            result = await getattr(client.telemetry, _TELEMETRY_ROUTES[endpoint])()
+
+        else:
+            # Paths look like vehicles/{vin}/{op}; two partitions avoid the
+            # per-branch list allocations of endpoint.split("/").
+            _, _, remainder = endpoint.partition("/")
+            vin, _, op = remainder.partition("/")
+
+            if op == "polling":
+                enabled_param = params.get("enabled")
+
+                if enabled_param is None and method == "GET":
+                    result = await client.telemetry.server_side_polling(vin, None)
+                elif enabled_param == "true" or method == "POST":
+                    result = await client.telemetry.server_side_polling(vin, True)
+                elif enabled_param == "false" or method == "DELETE":
+                    result = await client.telemetry.server_side_polling(vin, False)
+                else:
+                    raise HTTPException(400, "Invalid polling operation")
+
+            elif op == "refresh" and method == "POST":
+                result = await client.telemetry.vehicle_data_refresh(vin)
+
+            else:
+                return _error_response(404, f"Teslemetry endpoint not found: {endpoint}")
+
+        return _json_response(result)
+
+    except TessieAPIError as e:
+        return _error_response(e.status_code or 500, e.message)
+
+
+async def _handle_fleet(client: UnifiedTessieClient, endpoint: str, method: str,
+                        params: Dict[str, Any], json_body: Optional[Dict[str, Any]]) -> Response:
+    """Handle /api/fleet/* requests"""
+    if not client.fleet:
+        return _error_response(503, "Tesla Fleet API not configured")
+
+    try:
+        if endpoint == "vehicles":
+            result = await client.fleet.list_vehicles()
+
+        else:
+            vin, _, op = endpoint.partition("/")
+
+            if op == "vehicle_data":
+                endpoints_param = params.get("endpoints")
+                result = await client.fleet.vehicle_data(vin, endpoints_param)
+
+            elif op == "wake_up" and method == "POST":
+                result = await client.fleet.wake_up(vin)
+
+            elif op.startswith("command/") and method == "POST":
+                command = op[len("command/"):]
+                result = await client.fleet.command(vin, command, json_body)
+
+            else:
+                return _error_response(404, f"Fleet endpoint not found: {endpoint}")
+
+        return _json_response(result)
+
+    except TessieAPIError as e:
+        return _error_response(e.status_code or 500, e.message)
+
+
+# API sub-handlers keyed by the path segment after /api/, so dispatch is one
+# split plus one dict lookup instead of repeated startswith scans.
+_API_HANDLERS = {
+    "tessie": _handle_tessie,
+    "telemetry": _handle_telemetry,
+    "fleet": _handle_fleet,
+}
+
+
+# Error logging goes through a bounded queue drained by a background task so
+# the request path never blocks on a synchronous stderr write. Messages are
+# dropped on overflow instead of applying backpressure to requests.
+_LOG_QUEUE: "asyncio.Queue[str]" = asyncio.Queue(maxsize=1024)
+_LOG_BATCH_SIZE = 64
+# Strong reference to the consumer task: the loop only keeps weak refs, so
+# an unreferenced task can be garbage-collected mid-await. The owning loop
+# is tracked alongside it because the queue binds to the loop that first
+# awaits it — crossing loops (e.g. between tests) needs a fresh queue.
+_log_consumer_task: "asyncio.Task | None" = None
+_log_loop: "asyncio.AbstractEventLoop | None" = None
+
+
+async def _log_consumer(q: "asyncio.Queue[str]") -> None:
+    while True:
+        batch = [await q.get()]
+        while len(batch) < _LOG_BATCH_SIZE and not q.empty():
+            batch.append(q.get_nowait())
+        sys.stderr.write("\n".join(batch) + "\n")
+
+
+def _log_error(message: str) -> None:
+    """Queue a log line for the background consumer, dropping on overflow"""
+    global _log_consumer_task, _log_loop, _LOG_QUEUE
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No running loop (e.g. import-time use); write directly.
+        sys.stderr.write(message + "\n")
+        return
+
+    if _log_consumer_task is None or _log_consumer_task.done() or loop is not _log_loop:
+        if (
+            _log_consumer_task is not None
+            and _log_consumer_task.done()
+            and not _log_consumer_task.cancelled()
+        ):
+            # Retrieve a crashed consumer's exception so it isn't reported
+            # as never-retrieved at garbage collection.
+            _log_consumer_task.exception()
+        if loop is not _log_loop:
+            # Rebind to the new loop, carrying over undelivered messages;
+            # the previous consumer keeps its old queue and dies with its
+            # old loop.
+            old_queue = _LOG_QUEUE
+            _LOG_QUEUE = asyncio.Queue(maxsize=1024)
+            while not old_queue.empty():
+                _LOG_QUEUE.put_nowait(old_queue.get_nowait())
+        _log_loop = loop
+        _log_consumer_task = loop.create_task(_log_consumer(_LOG_QUEUE))
+
+    try:
+        _LOG_QUEUE.put_nowait(message)
+    except asyncio.QueueFull:
+        pass
+
+
+# Environment fallbacks resolved once at cold start. Worker env vars do not
+# change mid-isolate, so per-request lookups only touch env attributes.
+_TESSIE_TOKEN = os.getenv("TESSIE_API_KEY")
+_TELEMETRY_TOKEN = os.getenv("TESLEMETRY_API_KEY")
+_FLEET_TOKEN = os.getenv("FLEET_API_KEY")
+_FLEET_REGION = os.getenv("FLEET_REGION", "na")
+
+
+# One UnifiedTessieClient (plus its HealthChecker) per token configuration,
+# reused across requests so each call skips client construction and keeps the
+# underlying connection pool warm.
+_CLIENT_CACHE: Dict[tuple, UnifiedTessieClient] = {}
+_HEALTH_CHECKERS: Dict[tuple, HealthChecker] = {}
+
+
+def _get_client(
+    tessie_token: Optional[str],
+    telemetry_token: Optional[str],
+    fleet_token: Optional[str],
+    fleet_region: str,
+) -> tuple:
+    """Return the cached (client, health_checker) pair for this configuration."""
+    key = (tessie_token, telemetry_token, fleet_token, fleet_region)
+    client = _CLIENT_CACHE.get(key)
+    if client is None:
+        client = UnifiedTessieClient(
+            tessie_token=tessie_token,
+            telemetry_token=telemetry_token,
+            fleet_token=fleet_token,
+            fleet_region=fleet_region
+        )
+        _CLIENT_CACHE[key] = client
+        _HEALTH_CHECKERS[key] = HealthChecker(client)
+    return client, _HEALTH_CHECKERS[key]
+
+
+# Serialized /health and /status bodies keyed by path. Monitoring probes hit
+# these endpoints every few seconds; a short TTL collapses those bursts into
+# one round of upstream checks. Bodies are cached pre-serialized so cache hits
+# also skip json.dumps.
+_HEALTH_CACHE: Dict[str, tuple] = {}
+_HEALTH_CACHE_TTL = 10.0
+
+
+def _cached_health_body(path: str) -> Optional[str]:
+    entry = _HEALTH_CACHE.get(path)
+    if entry and time.monotonic() - entry[0] < _HEALTH_CACHE_TTL:
+        return entry[1]
+    return None
+
+
+async def close_clients() -> None:
+    """Close all cached clients. Intended for isolate shutdown and tests."""
+    for client in _CLIENT_CACHE.values():
+        await client.close()
+    _CLIENT_CACHE.clear()
+    _HEALTH_CHECKERS.clear()
+
+
+async def fetch(request, env, ctx):
+    """
+    Main Cloudflare Worker entry point
+
+    Routes:
+        GET  /health          - Unified health check for all APIs
+        GET  /status          - Detailed status including auth validation
+        GET  /api/tessie/*    - Tessie REST API proxy
+        GET  /api/telemetry/* - Teslemetry API proxy
+        GET  /api/fleet/*     - Tesla Fleet API proxy
+        *    *                - Static assets from ASSETS binding
+    """
+
+    parsed_url = urlparse(str(request.url))
+    path = parsed_url.path
+    method = request.method.upper()
+
+    # Initialize unified client from env bindings, falling back to the
+    # environment variables captured at cold start
+    tessie_token = getattr(env, "TESSIE_API_KEY", _TESSIE_TOKEN)
+    telemetry_token = getattr(env, "TESLEMETRY_API_KEY", _TELEMETRY_TOKEN)
+    fleet_token = getattr(env, "FLEET_API_KEY", _FLEET_TOKEN)
+    fleet_region = getattr(env, "FLEET_REGION", _FLEET_REGION)
+
+    client, health_checker = _get_client(tessie_token, telemetry_token, fleet_token, fleet_region)
+
+    try:
+        # ========== Health and Status Endpoints ==========
+
+        if path == "/health" and method == "GET":
+            """Unified health check for all APIs"""
+            pretty = _wants_pretty(parsed_url.query)
+            if not pretty:
+                cached = _cached_health_body(path)
+                if cached is not None:
+                    return Response(cached, status=200, headers=_JSON_HEADERS)
+
+            result = await health_checker.check_all()
+            if pretty:
+                return Response(json.dumps(result, indent=2), status=200, headers=_JSON_HEADERS)
+
+            body = _dumps(result)
+            # Do not cache failing results so recovery is visible immediately.
+            if result.get("status") != "unhealthy":
+                _HEALTH_CACHE[path] = (time.monotonic(), body)
+            return Response(body, status=200, headers=_JSON_HEADERS)
+
+        if path == "/status" and method == "GET":
+            """Detailed status including auth validation"""
+            pretty = _wants_pretty(parsed_url.query)
+            if not pretty:
+                cached = _cached_health_body(path)
+                if cached is not None:
+                    return Response(cached, status=200, headers=_JSON_HEADERS)
+
+            # The two probe rounds are independent; run them concurrently so
+            # /status costs max(RTT) instead of the sum.
+            health_result, auth_result = await asyncio.gather(
+                health_checker.check_all(),
+                health_checker.check_auth(),
+            )
+
+            payload = {
+                "health": health_result,
+                "authentication": auth_result,
+                "configuration": {
+                    "tessie_configured": tessie_token is not None,
+                    "telemetry_configured": telemetry_token is not None,
+                    "fleet_configured": fleet_token is not None,
+                    "fleet_region": fleet_region
+                }
+            }
+            if pretty:
+                return Response(json.dumps(payload, indent=2), status=200, headers=_JSON_HEADERS)
+
+            body = _dumps(payload)
+            if health_result.get("status") != "unhealthy":
+                _HEALTH_CACHE[path] = (time.monotonic(), body)
+            return Response(body, status=200, headers=_JSON_HEADERS)
+
+        # ========== API Proxy Routes ==========
+
+        if path.startswith("/api/"):
+            segments = path.split("/", 3)
+            if len(segments) == 4:
+                api_handler = _API_HANDLERS.get(segments[2])
+                if api_handler:
+                    endpoint = segments[3]
+                    params = _parse_query_params(parsed_url.query)
+                    json_body = await _parse_json_body(request) if method in ["POST", "PUT", "PATCH"] else None
+                    return await api_handler(client, endpoint, method, params, json_body)
+
+        # ========== Static Assets Fallback ==========
+
+        assets_binding = getattr(env, "ASSETS", None)
+        if assets_binding:
+            return await assets_binding.fetch(request)
+
+        return Response(_NOT_FOUND_BODY, status=404, headers=_JSON_HEADERS)
+
+    except HTTPException as e:
+        return _error_response(e.status, e.message)
+
+    except Exception as e:
+        _log_error(f"Unexpected error: {e}")
+        return _error_response(500, f"Internal Server Error: {str(e)}")
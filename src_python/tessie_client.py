@@ -1,372 +1,730 @@
-"""
-Unified Tessie Client Module
-
-This module provides a unified interface to all three Tessie-related APIs:
-1. Tesla Fleet API - Official Tesla Fleet management
-2. Teslemetry API - Third-party telemetry service
-3. Tessie REST API - Third-party vehicle management service
-
-All API clients share a common async HTTP client (httpx.AsyncClient) and
-provide consistent error handling and logging.
-"""
-
-import json
-import logging
-from enum import Enum
-from typing import Any, Dict, Optional
-from datetime import datetime
-
-import httpx
-
-
-# Configure structured logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
-
-
-class APIType(Enum):
-    """API type enumeration"""
-    FLEET = "fleet"
-    TELEMETRY = "telemetry"
-    TESSIE = "tessie"
-
-
-def log_api_call(api_type: APIType, endpoint: str, status: int, duration_ms: float, error: Optional[str] = None):
-    """Structured logging for API interactions"""
-    log_data = {
-        "event": "api_call",
-        "api": api_type.value,
-        "endpoint": endpoint,
-        "status": status,
-        "duration_ms": duration_ms,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
-    if error:
-        log_data["error"] = error
-
-    print(json.dumps(log_data))
-
-
-class TessieAPIError(Exception):
-    """Base exception for Tessie API errors"""
-    def __init__(self, message: str, status_code: Optional[int] = None):
-        self.message = message
-        self.status_code = status_code
-        super().__init__(self.message)
-
-
-class BaseAPIClient:
-    """Base class for all API clients with common functionality"""
-
-    def __init__(self, base_url: str, access_token: str, client: httpx.AsyncClient):
-        """
-        Initialize base API client
-
-        Args:
-            base_url: API base URL
-            access_token: API access token
-            client: Shared httpx AsyncClient instance
-        """
-        self.base_url = base_url.rstrip('/')
-        self.access_token = access_token
-        self.client = client
-        self.api_type: APIType = APIType.TESSIE  # Override in subclasses
-
-    async def _request(
-        self,
-        method: str,
-        endpoint: str,
-        params: Optional[Dict[str, Any]] = None,
-        json_data: Optional[Dict[str, Any]] = None
-    ) -> Dict[str, Any]:
-        """
-        Make an authenticated HTTP request
-
-        Args:
-            method: HTTP method (GET, POST, etc.)
-            endpoint: API endpoint path
-            params: Query parameters
-            json_data: JSON request body
-
-        Returns:
-            Response data as dictionary
-
-        Raises:
-            TessieAPIError: On API errors
-        """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
-        start_time = datetime.utcnow()
-
-        try:
-            response = await self.client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                params=params,
-                json=json_data,
-                timeout=30.0
-            )
-
-            duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-
-            log_api_call(
-                self.api_type,
-                endpoint,
-                response.status_code,
-                duration_ms
-            )
-
-            response.raise_for_status()
-            return response.json()
-
-        except httpx.HTTPStatusError as e:
-            duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-            error_msg = f"HTTP {e.response.status_code}: {e.response.text}"
-
-            log_api_call(
-                self.api_type,
-                endpoint,
-                e.response.status_code,
-                duration_ms,
-                error_msg
-            )
-
-            raise TessieAPIError(error_msg, e.response.status_code)
-
-        except Exception as e:
-            duration_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-            error_msg = f"Request failed: {str(e)}"
-
-            log_api_call(
-                self.api_type,
-                endpoint,
-                0,
-                duration_ms,
-                error_msg
-            )
-
-            raise TessieAPIError(error_msg)
-
-
-class TessieClient(BaseAPIClient):
-    """Tessie REST API client"""
-
-    def __init__(self, access_token: str, client: httpx.AsyncClient):
-        """Initialize Tessie API client"""
-        super().__init__("https://api.tessie.com", access_token, client)
-        self.api_type = APIType.TESSIE
-
-    async def list_vehicles(self, only_active: bool = True) -> Dict[str, Any]:
-        """List all vehicles"""
-        params = {"only_active": str(only_active).lower()}
-        return await self._request("GET", "vehicles", params=params)
-
-    async def state(self, vin: str) -> Dict[str, Any]:
-        """Get vehicle state"""
-        return await self._request("GET", f"{vin}/state")
-
-    async def battery(self, vin: str) -> Dict[str, Any]:
-        """Get battery information"""
-        return await self._request("GET", f"{vin}/battery")
-
-    async def battery_health(
-        self,
-        vin: str,
-        start: Optional[str] = None,
-        end: Optional[str] = None,
-        distance_format: str = "mi"
-    ) -> Dict[str, Any]:
-        """Get battery health history"""
-        params = {"distance_format": distance_format}
-        if start:
-            params["start"] = start
-        if end:
-            params["end"] = end
-        return await self._request("GET", f"{vin}/battery_health", params=params)
-
-    async def wake(self, vin: str) -> Dict[str, Any]:
-        """Wake up vehicle"""
-        return await self._request("POST", f"{vin}/wake")
-
-    async def start_charging(self, vin: str) -> Dict[str, Any]:
-        """Start charging"""
-        return await self._request("POST", f"{vin}/command/start_charging")
-
-    async def stop_charging(self, vin: str) -> Dict[str, Any]:
-        """Stop charging"""
-        return await self._request("POST", f"{vin}/command/stop_charging")
-
-    async def set_charge_limit(self, vin: str, percent: int) -> Dict[str, Any]:
-        """Set charge limit"""
-        return await self._request("POST", f"{vin}/command/set_charge_limit", json_data={"percent": percent})
-
-    async def lock(self, vin: str) -> Dict[str, Any]:
-        """Lock vehicle"""
-        return await self._request("POST", f"{vin}/command/lock")
-
-    async def unlock(self, vin: str) -> Dict[str, Any]:
-        """Unlock vehicle"""
-        return await self._request("POST", f"{vin}/command/unlock")
-
-    async def flash_lights(self, vin: str) -> Dict[str, Any]:
-        """Flash lights"""
-        return await self._request("POST", f"{vin}/command/flash_lights")
-
-    async def honk(self, vin: str) -> Dict[str, Any]:
-        """Honk horn"""
-        return await self._request("POST", f"{vin}/command/honk")
-
-    async def start_climate(self, vin: str) -> Dict[str, Any]:
-        """Start climate control"""
-        return await self._request("POST", f"{vin}/command/start_climate")
-
-    async def stop_climate(self, vin: str) -> Dict[str, Any]:
-        """Stop climate control"""
-        return await self._request("POST", f"{vin}/command/stop_climate")
-
-
-class TeslemetryClient(BaseAPIClient):
-    """Teslemetry API client"""
-
-    def __init__(self, access_token: str, client: httpx.AsyncClient, server: Optional[str] = None):
-        """Initialize Teslemetry API client"""
-        base_url = server or "https://api.teslemetry.com"
-        super().__init__(base_url, access_token, client)
-        self.api_type = APIType.TELEMETRY
-
-    async def ping(self) -> Dict[str, Any]:
-        """Health check endpoint"""
-        return await self._request("GET", "ping")
-
-    async def test(self) -> Dict[str, Any]:
-        """Test API credentials"""
-        return await self._request("GET", "test")
-
-    async def metadata(self) -> Dict[str, Any]:
-        """Get user metadata and scopes"""
-        return await self._request("GET", "metadata")
-
-    async def scopes(self) -> Dict[str, Any]:
-        """Get available permission scopes"""
-        return await self._request("GET", "scopes")
-
-    async def server_side_polling(self, vin: str, enabled: Optional[bool] = None) -> Dict[str, Any]:
-        """Manage server-side polling for a vehicle"""
-        if enabled is None:
-            return await self._request("GET", f"vehicles/{vin}/polling")
-        elif enabled:
-            return await self._request("POST", f"vehicles/{vin}/polling")
-        else:
-            return await self._request("DELETE", f"vehicles/{vin}/polling")
-
-    async def vehicle_data_refresh(self, vin: str) -> Dict[str, Any]:
-        """Force vehicle data refresh"""
-        return await self._request("POST", f"vehicles/{vin}/refresh")
-
-
-class FleetAPIClient(BaseAPIClient):
-    """Tesla Fleet API client"""
-
-    def __init__(self, access_token: str, client: httpx.AsyncClient, region: str = "na"):
-        """
-        Initialize Fleet API client
-
-        Args:
-            access_token: Fleet API access token
-            client: Shared httpx AsyncClient
-            region: Region code (na, eu, cn)
-        """
-        region_urls = {
-            "na": "https://fleet-api.prd.na.vn.cloud.tesla.com",
-            "eu": "https://fleet-api.prd.eu.vn.cloud.tesla.com",
-            "cn": "https://fleet-api.prd.cn.vn.cloud.tesla.cn"
-        }
-        base_url = region_urls.get(region, region_urls["na"])
-        super().__init__(base_url, access_token, client)
-        self.api_type = APIType.FLEET
-        self.region = region
-
-    async def list_vehicles(self) -> Dict[str, Any]:
-        """List all vehicles in fleet"""
-        return await self._request("GET", "api/1/vehicles")
-
-    async def vehicle_data(self, vin: str, endpoints: Optional[str] = None) -> Dict[str, Any]:
-        """
-        Get vehicle data
-
-        Args:
-            vin: Vehicle VIN
-            endpoints: Comma-separated list of endpoints to fetch
-        """
-        params = {"endpoints": endpoints} if endpoints else None
-        return await self._request("GET", f"api/1/vehicles/{vin}/vehicle_data", params=params)
-
-    async def wake_up(self, vin: str) -> Dict[str, Any]:
-        """Wake up vehicle"""
-        return await self._request("POST", f"api/1/vehicles/{vin}/wake_up")
-
-    async def command(self, vin: str, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """
-        Execute vehicle command
-
-        Args:
-            vin: Vehicle VIN
-            command: Command name (e.g., 'charge_start', 'charge_stop')
-            params: Command parameters
-        """
-        return await self._request("POST", f"api/1/vehicles/{vin}/command/{command}", json_data=params)
-
-
-class UnifiedTessieClient:
-    """
-    Unified client providing access to all three APIs through a single interface
-    """
-
-    def __init__(
-        self,
-        tessie_token: Optional[str] = None,
-        telemetry_token: Optional[str] = None,
-        fleet_token: Optional[str] = None,
-        fleet_region: str = "na"
-    ):
-        """
-        Initialize unified client with tokens for each API
-
-        Args:
-            tessie_token: Tessie API token
-            telemetry_token: Teslemetry API token
-            fleet_token: Tesla Fleet API token
-            fleet_region: Fleet API region (na, eu, cn)
-        """
-        self.client = httpx.AsyncClient()
-
-        # Initialize API clients if tokens provided
-        self.tessie: Optional[TessieClient] = None
-        self.telemetry: Optional[TeslemetryClient] = None
-        self.fleet: Optional[FleetAPIClient] = None
-
-        if tessie_token:
-            self.tessie = TessieClient(tessie_token, self.client)
-
-        if telemetry_token:
-            self.telemetry = TeslemetryClient(telemetry_token, self.client)
-
-        if fleet_token:
-            self.fleet = FleetAPIClient(fleet_token, self.client, fleet_region)
-
-    async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
-
-    async def __aenter__(self):
-        """Async context manager entry"""
-        return self
-
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        await self.close()
+"""
+Unified Tessie Client Module
+
+This module provides a unified interface to all three Tessie-related APIs:
+1. Tesla Fleet API - Official Tesla Fleet management
+2. Teslemetry API - Third-party telemetry service
+3. Tessie REST API - Third-party vehicle management service
+
+All API clients share a common async HTTP client (httpx.AsyncClient) and
+provide consistent error handling and logging.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import queue
+import time
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+
+import httpx
+
+from logging.handlers import QueueHandler, QueueListener
+
+try:  # C JSON codec; 3-10x faster on large vehicle_data payloads
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+try:  # incremental JSON parser used by FleetAPIClient.vehicle_data_stream
+    import ijson
+except ImportError:  # pragma: no cover - optional accelerator
+    ijson = None
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+
+class _JsonFormatter(logging.Formatter):
+    """Render dict records as compact JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = record.msg
+        if isinstance(msg, dict):
+            if orjson is not None:
+                return orjson.dumps(msg).decode()
+            return json.dumps(msg, separators=(",", ":"), default=str)
+        return super().format(record)
+
+
+class _PassthroughQueueHandler(QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+# Log records are queued and written by a background listener thread, so
+# the event loop never serializes on the stdout lock under load; JSON
+# serialization also moves off the hot path. The listener is started
+# lazily on the first log call: the Workers/Pyodide runtime cannot spawn
+# threads, and starting one at import would kill the worker there.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(_JsonFormatter())
+_log_listener: Optional[QueueListener] = None
+_log_handler_installed = False
+
+
+def _ensure_log_handler() -> None:
+    """Install the logging pipeline on first use.
+
+    Prefers the threaded QueueListener; where threads are unavailable
+    (Cloudflare Workers), falls back to the StreamHandler inline.
+    """
+
+    global _log_listener, _log_handler_installed
+    if _log_handler_installed:
+        return
+    _log_handler_installed = True
+    try:
+        _log_listener = QueueListener(_log_queue, _stream_handler)
+        _log_listener.start()
+    except RuntimeError:  # can't start new thread
+        _log_listener = None
+        logger.addHandler(_stream_handler)
+    else:
+        logger.addHandler(_PassthroughQueueHandler(_log_queue))
+
+
+# Shared pool sizing and timeouts for the unified client. A generous pool
+# keeps multi-VIN fan-outs from queueing on connections, and HTTP/2 lets
+# concurrent requests share one TLS connection per host.
+DEFAULT_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+# Fleet API base URLs by region, shared by all FleetAPIClient instances.
+_REGION_URLS = {
+    "na": "https://fleet-api.prd.na.vn.cloud.tesla.com",
+    "eu": "https://fleet-api.prd.eu.vn.cloud.tesla.com",
+    "cn": "https://fleet-api.prd.cn.vn.cloud.tesla.cn"
+}
+
+
+class _TessiePaths(NamedTuple):
+    """Prebuilt Tessie endpoint suffixes for one VIN."""
+    state: str
+    battery: str
+    battery_health: str
+    wake: str
+    start_charging: str
+    stop_charging: str
+    set_charge_limit: str
+    lock: str
+    unlock: str
+    flash_lights: str
+    honk: str
+    start_climate: str
+    stop_climate: str
+
+
+class _FleetPaths(NamedTuple):
+    """Prebuilt Fleet API endpoint suffixes for one VIN."""
+    vehicle_data: str
+    wake_up: str
+    command_prefix: str
+
+
+@functools.lru_cache(maxsize=1024)
+def _tessie_paths(vin: str) -> _TessiePaths:
+    """Memoize per-VIN Tessie endpoint strings.
+
+    A polling worker hits the same handful of VINs thousands of times, so
+    the f-string formatting in every command method is pure repeat work.
+    """
+    return _TessiePaths(
+        state=f"{vin}/state",
+        battery=f"{vin}/battery",
+        battery_health=f"{vin}/battery_health",
+        wake=f"{vin}/wake",
+        start_charging=f"{vin}/command/start_charging",
+        stop_charging=f"{vin}/command/stop_charging",
+        set_charge_limit=f"{vin}/command/set_charge_limit",
+        lock=f"{vin}/command/lock",
+        unlock=f"{vin}/command/unlock",
+        flash_lights=f"{vin}/command/flash_lights",
+        honk=f"{vin}/command/honk",
+        start_climate=f"{vin}/command/start_climate",
+        stop_climate=f"{vin}/command/stop_climate",
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _fleet_paths(vin: str) -> _FleetPaths:
+    """Memoize per-VIN Fleet API endpoint strings."""
+    return _FleetPaths(
+        vehicle_data=f"api/1/vehicles/{vin}/vehicle_data",
+        wake_up=f"api/1/vehicles/{vin}/wake_up",
+        command_prefix=f"api/1/vehicles/{vin}/command/",
+    )
+
+
+class APIType(Enum):
+    """API type enumeration"""
+    FLEET = "fleet"
+    TELEMETRY = "telemetry"
+    TESSIE = "tessie"
+
+
+def log_api_call(api_type: APIType, endpoint: str, status: int, duration_ms: float, error: Optional[str] = None):
+    """Structured logging for API interactions"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    _ensure_log_handler()
+
+    log_data = {
+        "event": "api_call",
+        "api": api_type.value,
+        "endpoint": endpoint,
+        "status": status,
+        "duration_ms": duration_ms,
+        "timestamp": datetime.utcnow(),
+    }
+    if error:
+        log_data["error"] = error
+
+    logger.info(log_data)
+
+
+# Upper bound on cached entries per client: one key per method x argument
+# combination ever polled would otherwise grow without limit in a
+# long-running isolate. Oldest entry is evicted on insert at the cap.
+_CACHE_MAX_ENTRIES = 1024
+
+
+def cacheable(ttl: float = 5.0, swr: float = 10.0):
+    """
+    Cache an idempotent GET method's result with TTL + stale-while-revalidate
+
+    Within ttl seconds the cached result is returned directly. Between ttl
+    and ttl+swr the stale result is returned immediately and a single
+    background refresh is started. Past the SWR window the call goes
+    upstream synchronously. Entries live in the owning client's _cache,
+    keyed by method name and arguments and capped at _CACHE_MAX_ENTRIES;
+    invalidate_cache() clears them.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            key = (fn.__name__, args, tuple(sorted(kwargs.items())))
+            entry = self._cache.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry[0]
+                if age < ttl:
+                    return entry[1]
+                if age < ttl + swr:
+                    if key not in self._refreshing:
+                        # Hold the task: asyncio only keeps weak references,
+                        # and a GC'd task would silently abort the refresh.
+                        self._refreshing[key] = asyncio.create_task(
+                            self._refresh_cached(key, fn, args, kwargs)
+                        )
+                    return entry[1]
+
+            value = await fn(self, *args, **kwargs)
+            self._store_cached(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+class _AsyncByteReader:
+    """Adapt an async byte iterator to the async file API ijson expects."""
+
+    def __init__(self, aiter):
+        self._aiter = aiter.__aiter__()
+
+    async def read(self, size: int = -1) -> bytes:
+        try:
+            return await self._aiter.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+class TessieAPIError(Exception):
+    """Base exception for Tessie API errors"""
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+
+class BaseAPIClient:
+    """Base class for all API clients with common functionality"""
+
+    __slots__ = ("base_url", "access_token", "client", "api_type", "_headers", "_url_prefix", "_cache", "_refreshing")
+
+    def __init__(self, base_url: str, access_token: str, client: httpx.AsyncClient):
+        """
+        Initialize base API client
+
+        Args:
+            base_url: API base URL
+            access_token: API access token
+            client: Shared httpx AsyncClient instance
+        """
+        self.base_url = base_url.rstrip('/')
+        self.access_token = access_token
+        self.client = client
+        self.api_type: APIType = APIType.TESSIE  # Override in subclasses
+        # Hoisted out of _request: the auth header and URL prefix never change
+        # for the lifetime of the client, so the hot path skips a dict build
+        # and an f-string format per call.
+        self._headers = {
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json"
+        }
+        self._url_prefix = self.base_url + "/"
+        # Response cache for @cacheable GET methods, plus the in-flight
+        # background refresh task per key (strong refs keep them alive).
+        self._cache: Dict[tuple, tuple] = {}
+        self._refreshing: Dict[tuple, asyncio.Task] = {}
+
+    def rotate_token(self, new_token: str) -> None:
+        """Swap the access token, replacing the cached headers atomically.
+
+        _request reads self._headers once per call, so in-flight requests
+        keep the dict they started with and new calls pick up the new token.
+        """
+        self.access_token = new_token
+        self._headers = {
+            "Authorization": f"Bearer {new_token}",
+            "Content-Type": "application/json"
+        }
+
+    def invalidate_cache(self) -> None:
+        """Drop cached GET responses and cancel in-flight refreshes."""
+        self._cache.clear()
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+
+    def _store_cached(self, key: tuple, value: Any) -> None:
+        """Insert a @cacheable entry, evicting the oldest one at the cap."""
+        if len(self._cache) >= _CACHE_MAX_ENTRIES and key not in self._cache:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = (time.monotonic(), value)
+
+    async def _refresh_cached(self, key: tuple, fn, args: tuple, kwargs: dict) -> None:
+        """Background stale-while-revalidate refresh for one cache key."""
+        try:
+            value = await fn(self, *args, **kwargs)
+        except TessieAPIError:
+            # Keep serving stale on refresh failure; a later call retries.
+            return
+        else:
+            self._store_cached(key, value)
+        finally:
+            self._refreshing.pop(key, None)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Make an authenticated HTTP request
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path
+            params: Query parameters
+            json_data: JSON request body
+
+        Returns:
+            Response data as dictionary
+
+        Raises:
+            TessieAPIError: On API errors
+        """
+        url = self._url_prefix + endpoint.lstrip('/')
+        headers = self._headers
+
+        start_ns = time.perf_counter_ns()
+
+        try:
+            response = await self.client.request(
+                method=method,
+                url=url,
+                headers=headers,
+                params=params,
+                json=json_data
+            )
+
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+
+            log_api_call(
+                self.api_type,
+                endpoint,
+                response.status_code,
+                duration_ms
+            )
+
+            response.raise_for_status()
+            if orjson is not None:
+                return orjson.loads(response.content)
+            return response.json()
+
+        except httpx.HTTPStatusError as e:
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            error_msg = f"HTTP {e.response.status_code}: {e.response.text}"
+
+            log_api_call(
+                self.api_type,
+                endpoint,
+                e.response.status_code,
+                duration_ms,
+                error_msg
+            )
+
+            raise TessieAPIError(error_msg, e.response.status_code)
+
+        except Exception as e:
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
+            error_msg = f"Request failed: {str(e)}"
+
+            log_api_call(
+                self.api_type,
+                endpoint,
+                0,
+                duration_ms,
+                error_msg
+            )
+
+            raise TessieAPIError(error_msg)
+
+    async def _fan_out(
+        self,
+        fn: Callable[[str], Any],
+        vins: List[str],
+        concurrency: int
+    ) -> Dict[str, Any]:
+        """
+        Run a single-VIN coroutine function over many VINs concurrently
+
+        Concurrency is bounded by a semaphore so large fleets don't swamp
+        the connection pool; results come back keyed by VIN.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(vin: str):
+            async with sem:
+                return vin, await fn(vin)
+
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(one(vin)) for vin in vins]
+
+        return dict(task.result() for task in tasks)
+
+
+class TessieClient(BaseAPIClient):
+    """Tessie REST API client"""
+
+    __slots__ = ()
+
+    def __init__(self, access_token: str, client: httpx.AsyncClient):
+        """Initialize Tessie API client"""
+        super().__init__("https://api.tessie.com", access_token, client)
+        self.api_type = APIType.TESSIE
+
+    async def list_vehicles(self, only_active: bool = True) -> Dict[str, Any]:
+        """List all vehicles"""
+        params = {"only_active": str(only_active).lower()}
+        return await self._request("GET", "vehicles", params=params)
+
+    @cacheable(ttl=5.0, swr=10.0)
+    async def state(self, vin: str) -> Dict[str, Any]:
+        """Get vehicle state"""
+        return await self._request("GET", _tessie_paths(vin).state)
+
+    @cacheable(ttl=5.0, swr=10.0)
+    async def battery(self, vin: str) -> Dict[str, Any]:
+        """Get battery information"""
+        return await self._request("GET", _tessie_paths(vin).battery)
+
+    async def batch_state(self, vins: List[str], *, concurrency: int = 20) -> Dict[str, Any]:
+        """Get state for many vehicles concurrently, keyed by VIN"""
+        return await self._fan_out(self.state, vins, concurrency)
+
+    async def batch_battery(self, vins: List[str], *, concurrency: int = 20) -> Dict[str, Any]:
+        """Get battery information for many vehicles concurrently, keyed by VIN"""
+        return await self._fan_out(self.battery, vins, concurrency)
+
+    async def battery_health(
+        self,
+        vin: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        distance_format: str = "mi"
+    ) -> Dict[str, Any]:
+        """Get battery health history"""
+        params = {"distance_format": distance_format}
+        if start:
+            params["start"] = start
+        if end:
+            params["end"] = end
+        return await self._request("GET", _tessie_paths(vin).battery_health, params=params)
+
+    async def wake(self, vin: str) -> Dict[str, Any]:
+        """Wake up vehicle"""
+        return await self._request("POST", _tessie_paths(vin).wake)
+
+    async def start_charging(self, vin: str) -> Dict[str, Any]:
+        """Start charging"""
+        return await self._request("POST", _tessie_paths(vin).start_charging)
+
+    async def stop_charging(self, vin: str) -> Dict[str, Any]:
+        """Stop charging"""
+        return await self._request("POST", _tessie_paths(vin).stop_charging)
+
+    async def set_charge_limit(self, vin: str, percent: int) -> Dict[str, Any]:
+        """Set charge limit"""
+        return await self._request("POST", _tessie_paths(vin).set_charge_limit, json_data={"percent": percent})
+
+    async def lock(self, vin: str) -> Dict[str, Any]:
+        """Lock vehicle"""
+        return await self._request("POST", _tessie_paths(vin).lock)
+
+    async def unlock(self, vin: str) -> Dict[str, Any]:
+        """Unlock vehicle"""
+        return await self._request("POST", _tessie_paths(vin).unlock)
+
+    async def flash_lights(self, vin: str) -> Dict[str, Any]:
+        """Flash lights"""
+        return await self._request("POST", _tessie_paths(vin).flash_lights)
+
+    async def honk(self, vin: str) -> Dict[str, Any]:
+        """Honk horn"""
+        return await self._request("POST", _tessie_paths(vin).honk)
+
+    async def start_climate(self, vin: str) -> Dict[str, Any]:
+        """Start climate control"""
+        return await self._request("POST", _tessie_paths(vin).start_climate)
+
+    async def stop_climate(self, vin: str) -> Dict[str, Any]:
+        """Stop climate control"""
+        return await self._request("POST", _tessie_paths(vin).stop_climate)
+
+
+class TeslemetryClient(BaseAPIClient):
+    """Teslemetry API client"""
+
+    __slots__ = ()
+
+    def __init__(self, access_token: str, client: httpx.AsyncClient, server: Optional[str] = None):
+        """Initialize Teslemetry API client"""
+        base_url = server or "https://api.teslemetry.com"
+        super().__init__(base_url, access_token, client)
+        self.api_type = APIType.TELEMETRY
+
+    async def ping(self) -> Dict[str, Any]:
+        """Health check endpoint"""
+        return await self._request("GET", "ping")
+
+    async def test(self) -> Dict[str, Any]:
+        """Test API credentials"""
+        return await self._request("GET", "test")
+
+    async def metadata(self) -> Dict[str, Any]:
+        """Get user metadata and scopes"""
+        return await self._request("GET", "metadata")
+
+    async def scopes(self) -> Dict[str, Any]:
+        """Get available permission scopes"""
+        return await self._request("GET", "scopes")
+
+    async def server_side_polling(self, vin: str, enabled: Optional[bool] = None) -> Dict[str, Any]:
+        """Manage server-side polling for a vehicle"""
+        if enabled is None:
+            return await self._request("GET", f"vehicles/{vin}/polling")
+        elif enabled:
+            return await self._request("POST", f"vehicles/{vin}/polling")
+        else:
+            return await self._request("DELETE", f"vehicles/{vin}/polling")
+
+    async def vehicle_data_refresh(self, vin: str) -> Dict[str, Any]:
+        """Force vehicle data refresh"""
+        return await self._request("POST", f"vehicles/{vin}/refresh")
+
+
+class FleetAPIClient(BaseAPIClient):
+    """Tesla Fleet API client"""
+
+    __slots__ = ("region",)
+
+    def __init__(self, access_token: str, client: httpx.AsyncClient, region: str = "na"):
+        """
+        Initialize Fleet API client
+
+        Args:
+            access_token: Fleet API access token
+            client: Shared httpx AsyncClient
+            region: Region code (na, eu, cn)
+        """
+        base_url = _REGION_URLS.get(region) or _REGION_URLS["na"]
+        super().__init__(base_url, access_token, client)
+        self.api_type = APIType.FLEET
+        self.region = region
+
+    async def list_vehicles(self) -> Dict[str, Any]:
+        """List all vehicles in fleet"""
+        return await self._request("GET", "api/1/vehicles")
+
+    @cacheable(ttl=5.0, swr=10.0)
+    async def vehicle_data(self, vin: str, endpoints: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get vehicle data
+
+        Args:
+            vin: Vehicle VIN
+            endpoints: Comma-separated list of endpoints to fetch
+        """
+        params = {"endpoints": endpoints} if endpoints else None
+        return await self._request("GET", _fleet_paths(vin).vehicle_data, params=params)
+
+    async def batch_vehicle_data(
+        self,
+        vins: List[str],
+        endpoints: Optional[str] = None,
+        *,
+        concurrency: int = 20
+    ) -> Dict[str, Any]:
+        """Get vehicle data for many vehicles concurrently, keyed by VIN"""
+        return await self._fan_out(
+            lambda vin: self.vehicle_data(vin, endpoints), vins, concurrency
+        )
+
+    async def vehicle_data_stream(self, vin: str, fields: List[str]) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Stream selected vehicle_data fields without materializing the full tree
+
+        The full vehicle_data payload (all endpoints) can be large; this
+        parses the response incrementally and yields (field, value) pairs as
+        they arrive, so a caller interested in one or two endpoints never
+        holds the whole document in memory. Requires the optional ijson
+        package; use vehicle_data() for the regular full-DOM path.
+
+        Args:
+            vin: Vehicle VIN
+            fields: vehicle_data endpoint names to yield (e.g. ["charge_state"])
+
+        Yields:
+            (field, value) tuples in response order
+
+        Raises:
+            TessieAPIError: On API errors, or if ijson is not installed
+        """
+        if ijson is None:
+            raise TessieAPIError("vehicle_data_stream requires the optional 'ijson' package")
+
+        wanted = frozenset(fields)
+        url = self._url_prefix + _fleet_paths(vin).vehicle_data
+        params = {"endpoints": ",".join(fields)}
+
+        try:
+            async with self.client.stream(
+                "GET", url, headers=self._headers, params=params
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                # One pass over the byte stream: kvitems walks the "response"
+                # object and yields each endpoint as soon as it is complete.
+                source = _AsyncByteReader(response.aiter_bytes())
+                async for key, value in ijson.kvitems(source, "response"):
+                    if key in wanted:
+                        yield key, value
+
+        except httpx.HTTPStatusError as e:
+            error_msg = f"HTTP {e.response.status_code}: {e.response.text}"
+            log_api_call(self.api_type, _fleet_paths(vin).vehicle_data, e.response.status_code, 0.0, error_msg)
+            raise TessieAPIError(error_msg, e.response.status_code)
+
+    async def wake_up(self, vin: str) -> Dict[str, Any]:
+        """Wake up vehicle"""
+        return await self._request("POST", _fleet_paths(vin).wake_up)
+
+    async def command(self, vin: str, command: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Execute vehicle command
+
+        Args:
+            vin: Vehicle VIN
+            command: Command name (e.g., 'charge_start', 'charge_stop')
+            params: Command parameters
+        """
+        return await self._request("POST", _fleet_paths(vin).command_prefix + command, json_data=params)
+
+
+class UnifiedTessieClient:
+    """
+    Unified client providing access to all three APIs through a single interface
+    """
+
+    def __init__(
+        self,
+        tessie_token: Optional[str] = None,
+        telemetry_token: Optional[str] = None,
+        fleet_token: Optional[str] = None,
+        fleet_region: str = "na",
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Initialize unified client with tokens for each API
+
+        All three sub-clients share one httpx.AsyncClient, so they draw from
+        a single connection pool and DNS cache. Pass an existing client to
+        share that pool across UnifiedTessieClient instances too; externally
+        provided clients are not closed by close().
+
+        Args:
+            tessie_token: Tessie API token
+            telemetry_token: Teslemetry API token
+            fleet_token: Tesla Fleet API token
+            fleet_region: Fleet API region (na, eu, cn)
+            client: Optional shared httpx AsyncClient
+        """
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient(
+            limits=DEFAULT_LIMITS,
+            timeout=DEFAULT_TIMEOUT,
+            http2=True,
+        )
+
+        # Initialize API clients if tokens provided
+        self.tessie: Optional[TessieClient] = None
+        self.telemetry: Optional[TeslemetryClient] = None
+        self.fleet: Optional[FleetAPIClient] = None
+
+        if tessie_token:
+            self.tessie = TessieClient(tessie_token, self.client)
+
+        if telemetry_token:
+            self.telemetry = TeslemetryClient(telemetry_token, self.client)
+
+        if fleet_token:
+            self.fleet = FleetAPIClient(fleet_token, self.client, fleet_region)
+
+    async def close(self):
+        """Close the HTTP client if this instance owns it"""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
@@ -7,31 +7,67 @@ from typing import Any, Dict, Optional
 
 DEFAULT_VIN = "TESTVIN1234567890"
 
+# Canned responses are built once at import (and on reset_cache()) so each
+# fake call is a dict lookup instead of an os.getenv plus dict rebuild.
+# Callers get the shared dicts and must treat them as read-only.
+_VIN: str
+_VEHICLES_RESPONSE: Dict[str, Any]
+_STATE_RESPONSE: Dict[str, Any]
+_CANNED: Dict[str, Dict[str, Any]]
+
+# Bumped on every rebuild so caches layered on top of get_fake_response
+# (tessie_wrapper._cached_fake) can key entries to one generation of
+# canned data instead of serving pre-reset responses forever.
+_GENERATION = 0
+
+
+def cache_generation() -> int:
+    """Return the current canned-data generation."""
+
+    return _GENERATION
+
+
+def reset_cache() -> None:
+    """Rebuild the canned responses, re-reading TESLA_VIN from the env.
+
+    Call this from tests that change TESLA_VIN after this module was
+    imported.
+    """
+
+    global _VIN, _VEHICLES_RESPONSE, _STATE_RESPONSE, _CANNED, _GENERATION
+    _GENERATION += 1
+    _VIN = os.getenv("TESLA_VIN", DEFAULT_VIN)
+    _VEHICLES_RESPONSE = {
+        "count": 1,
+        "results": [
+            {
+                "vin": _VIN,
+                "state": "online",
+                "display_name": "Simulated Tessie",
+                "id": f"{_VIN}-simulated",
+            }
+        ],
+    }
+    _STATE_RESPONSE = {"vin": _VIN, "state": "online"}
+    _CANNED = {"/vehicles": _VEHICLES_RESPONSE}
+
+
+reset_cache()
+
 
 def _resolve_vin() -> str:
-    return os.getenv("TESLA_VIN", DEFAULT_VIN)
+    return _VIN
 
 
 def get_fake_response(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Return a canned response for the requested Tessie API path."""
 
-    if path == "/vehicles":
-        vin = _resolve_vin()
-        return {
-            "count": 1,
-            "results": [
-                {
-                    "vin": vin,
-                    "state": "online",
-                    "display_name": "Simulated Tessie",
-                    "id": f"{vin}-simulated",
-                }
-            ],
-        }
+    canned = _CANNED.get(path)
+    if canned is not None:
+        return canned
 
     if path.endswith("/state"):
-        vin = _resolve_vin()
-        return {"vin": vin, "state": "online"}
+        return _STATE_RESPONSE
 
     # Generic fallback for endpoints that do not yet have bespoke canned data.
     return {
@@ -3,15 +3,69 @@
 from __future__ import annotations
 
 import argparse
-import datetime as dt
+import base64
+import functools
+import hashlib
+import hmac
 import json
 import os
-from typing import Any, Dict, Iterable
+import time
+from typing import Any, Dict, Iterable, Optional
 
 import jwt
 
+try:  # optional C JSON encoder for the inline signing path
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
 DEFAULT_EXPIRATION_SECONDS = 30 * 60  # 30 minutes
 
+# Matches the header PyJWT emits for HS256, pre-encoded once.
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+@functools.lru_cache(maxsize=8)
+def _primed(secret_bytes: bytes) -> "hmac.HMAC":
+    """Return an HMAC object with the key schedule already run.
+
+    Callers copy() it per token, skipping the inner/outer pad setup that
+    hmac.new pays on every call for the same secret.
+    """
+
+    return hmac.new(secret_bytes, b"", hashlib.sha256)
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+_SCALAR_CLAIM_TYPES = (str, int, float, bool, type(None))
+
+
+def _encode_hs256_fast(payload: Dict[str, Any], secret: str) -> Optional[str]:
+    """Sign the payload inline when every claim is a JSON scalar.
+
+    Returns None when the payload needs PyJWT's claim coercion (datetime
+    iat/exp values, nested structures), letting the caller fall back.
+    """
+
+    for value in payload.values():
+        # type() rather than isinstance: bool/int subclasses and types with
+        # exotic encodings (datetime, enums) must take the PyJWT path.
+        if type(value) not in _SCALAR_CLAIM_TYPES:
+            return None
+
+    if orjson is not None:
+        payload_json = orjson.dumps(payload)
+    else:
+        payload_json = json.dumps(payload, separators=(",", ":")).encode()
+
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(payload_json)
+    mac = _primed(secret.encode()).copy()
+    mac.update(signing_input)
+    return (signing_input + b"." + _b64url(mac.digest())).decode("ascii")
+
 
 def generate_worker_jwt(
     secret: str,
@@ -22,15 +76,18 @@ def generate_worker_jwt(
 ) -> str:
     """Return a signed HS256 JWT for authenticating with the worker."""
 
-    now = dt.datetime.utcnow()
+    now_ts = int(time.time())
     payload: Dict[str, Any] = {
         "sub": subject,
-        "iat": now,
-        "exp": now + dt.timedelta(seconds=expires_in),
+        "iat": now_ts,
+        "exp": now_ts + expires_in,
     }
     if additional_claims:
         payload.update(additional_claims)
 
+    token = _encode_hs256_fast(payload, secret)
+    if token is not None:
+        return token
     return jwt.encode(payload, secret, algorithm="HS256")
 
 
@@ -1,34 +1,163 @@
+import asyncio
+import copy
+import functools
+import json
 import os
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Final, Optional
 
 import aiohttp
+from multidict import CIMultiDict
 
-from .fake_api import get_fake_response
+from .fake_api import cache_generation, get_fake_response
 
+try:  # C JSON codec for response decode and request-body encode
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
 
-def _normalize_flag(value: Optional[str]) -> str:
-    return (value or "").strip().lower()
+if orjson is not None:
+    def _json_serialize(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _json_serialize = json.dumps
 
+_BASE: Final[str] = "https://api.tessie.com"
+
+
+@functools.lru_cache(maxsize=8)
+def _headers_for(api_key: str) -> "CIMultiDict[str]":
+    """Build the request headers for an API key once and reuse them.
+
+    CIMultiDict lets aiohttp skip re-normalizing the header names on every
+    request; callers must treat the cached mapping as read-only.
+    """
+
+    return CIMultiDict({
+        aiohttp.hdrs.AUTHORIZATION: f"Bearer {api_key}",
+        aiohttp.hdrs.CONTENT_TYPE: "application/json",
+    })
+
+# Shared upstream session, created lazily on first use. Callers that pass
+# session=None amortize one TCP+TLS handshake to api.tessie.com across all
+# requests instead of paying it per ClientSession.
+_SESSION: Optional[aiohttp.ClientSession] = None
+_SESSION_LOCK = asyncio.Lock()
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Return the shared ClientSession, creating it on first use."""
+
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        async with _SESSION_LOCK:
+            if _SESSION is None or _SESSION.closed:
+                # Pool sizing is env-tunable so high-concurrency callers can
+                # raise the limits without a code change; cleanup of closed
+                # transports keeps idle-expired slots reusable instead of
+                # forcing a fresh TLS handshake.
+                # base_url pre-parses the origin once, so request-time URL
+                # construction is a cheap join instead of a yarl re-parse.
+                _SESSION = aiohttp.ClientSession(
+                    base_url=_BASE,
+                    connector=aiohttp.TCPConnector(
+                        limit=int(os.getenv("TESSIE_POOL_LIMIT", "100")),
+                        limit_per_host=int(os.getenv("TESSIE_POOL_PER_HOST", "32")),
+                        ttl_dns_cache=int(os.getenv("TESSIE_DNS_TTL", "300")),
+                        keepalive_timeout=float(os.getenv("TESSIE_KEEPALIVE", "75")),
+                        enable_cleanup_closed=True,
+                    ),
+                    json_serialize=_json_serialize,
+                )
+    return _SESSION
 
-def _should_use_fake(api_key: Optional[str]) -> bool:
-    """Return True when a deterministic fake response should be used."""
 
-    if _normalize_flag(os.getenv("TESSIE_USE_FAKE_RESPONSES")) in {"1", "true", "yes", "on"}:
+async def close_session() -> None:
+    """Close the shared session. Intended for shutdown hooks and tests."""
+
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+# Common spellings of a truthy flag, pre-folded so the usual case is a
+# single hash lookup with no strip/lower allocations. Anything else still
+# goes through full normalization, so values like " 1 " or "tRue" keep
+# enabling fake mode as before.
+_TRUTHY: Final[frozenset] = frozenset((
+    "1", "true", "yes", "on",
+    "TRUE", "YES", "ON",
+    "True", "Yes", "On",
+))
+_TRUTHY_FOLDED: Final[frozenset] = frozenset(("1", "true", "yes", "on"))
+
+
+def _normalize_flag(value: Optional[str]) -> bool:
+    if not value:
+        return False
+    if value in _TRUTHY:
         return True
+    return value.strip().lower() in _TRUTHY_FOLDED
 
-    fake_key = os.getenv("TESSIE_FAKE_API_KEY", "FAKE_TESSIE_KEY")
-    return api_key == fake_key
 
+# Fake-mode configuration, resolved once at import: env vars don't change
+# mid-process in practice, so the per-request os.getenv lookups and flag
+# normalization are pure overhead on the hot path.
+_USE_FAKE_ENV: bool
+_FAKE_KEY: str
 
-async def tessieRequest(
-    session: aiohttp.ClientSession,
-    method: str,
-    path: str,
-    api_key: Optional[str],
-    params: Optional[Dict[str, Any]] = None,
+
+def refresh_env() -> None:
+    """Re-read the fake-mode env vars. For tests that mutate them mid-run."""
+
+    global _USE_FAKE_ENV, _FAKE_KEY
+    _USE_FAKE_ENV = _normalize_flag(os.getenv("TESSIE_USE_FAKE_RESPONSES"))
+    _FAKE_KEY = os.getenv("TESSIE_FAKE_API_KEY", "FAKE_TESSIE_KEY")
+    # The per-key decisions derived from these vars are memoized; drop them
+    # so stale fake-vs-live verdicts don't outlive the refresh.
+    get_config.cache_clear()
+    _headers_for.cache_clear()
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_fake(
+    path: str, params_key: Optional[frozenset], generation: int
 ) -> Dict[str, Any]:
+    """Memoized fake responses keyed by path, hashable params and the
+    canned-data generation, so fake_api.reset_cache() takes effect here too.
+    """
+
+    params = dict(params_key) if params_key else None
+    return get_fake_response(path, params=params)
+
+
+def _should_use_fake(api_key: Optional[str]) -> bool:
+    """Return True when a deterministic fake response should be used."""
+
+    return _USE_FAKE_ENV or api_key == _FAKE_KEY
+
+
+@dataclass(frozen=True, slots=True)
+class TessieConfig:
+    """Fake-vs-live decision and request constants for one API key."""
+
+    mode: str  # "fake" or "live"
+    headers: Optional["CIMultiDict[str]"]
+    base_url: str = _BASE
+
+
+@functools.lru_cache(maxsize=4)
+def get_config(api_key: Optional[str]) -> TessieConfig:
+    """Resolve the per-key request configuration once per process.
+
+    The fake-vs-live decision and the header mapping are constants for a
+    given key, so tessieRequest's per-call work collapses to one cache
+    lookup and one branch.
+    """
+
     if _should_use_fake(api_key):
-        return get_fake_response(path, params=params)
+        return TessieConfig(mode="fake", headers=None)
 
     if not api_key:
         raise ValueError(
@@ -36,11 +165,115 @@ async def tessieRequest(
             "or pass api_key explicitly."
         )
 
-    url = f"https://api.tessie.com{path}"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
+    return TessieConfig(mode="live", headers=_headers_for(api_key))
+
+
+refresh_env()
+
+
+async def _tessie_request_fake(
+    session: Optional[aiohttp.ClientSession],
+    method: str,
+    path: str,
+    api_key: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Fake-mode implementation: every request is served from canned data."""
+
+    try:
+        params_key = frozenset(params.items()) if params else None
+    except TypeError:
+        # Unhashable param values; skip the cache for this call.
+        return get_fake_response(path, params=params)
+    # Shallow copy so callers mutating the top level don't poison the
+    # cache; nested values are shared and must be treated as read-only.
+    return copy.copy(_cached_fake(path, params_key, cache_generation()))
+
+
+async def _tessie_request_live(
+    session: Optional[aiohttp.ClientSession],
+    method: str,
+    path: str,
+    api_key: Optional[str],
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Live-mode implementation; per-key fake configs are still honored."""
+
+    cfg = get_config(api_key)
+    if cfg.mode == "fake":
+        return await _tessie_request_fake(session, method, path, api_key, params)
+
+    if session is None:
+        # The shared session carries base_url, so only the path is joined.
+        session = await _get_session()
+        url = path
+    else:
+        url = cfg.base_url + path
+
+    headers = cfg.headers
     async with session.request(method, url, headers=headers, params=params) as response:
         response.raise_for_status()
-        return await response.json()
+        # Decode from the buffered bytes directly: the API is JSON-only, so
+        # the content-type re-validation inside response.json() is skipped.
+        # When Content-Length is present (and the body isn't re-encoded, so
+        # the declared size matches what the stream yields), read exactly
+        # that many bytes into one pre-sized buffer; chunked responses fall
+        # back to the plain read-to-EOF path.
+        content_length = response.headers.get(aiohttp.hdrs.CONTENT_LENGTH)
+        if content_length and aiohttp.hdrs.CONTENT_ENCODING not in response.headers:
+            try:
+                data = await response.content.readexactly(int(content_length))
+            except (ValueError, asyncio.IncompleteReadError):
+                data = await response.read()
+        else:
+            data = await response.read()
+        if not data:
+            return {}
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+# Bind the public name once at import: when TESSIE_USE_FAKE_RESPONSES is on,
+# live-mode overhead disappears entirely; otherwise production callers never
+# pay for the fake-mode branch. Note that modules doing
+# `from .tessie_wrapper import tessieRequest` capture the binding at their
+# import time; use refresh() before importing them when toggling the env in
+# tests, or call via the module attribute.
+tessieRequest = _tessie_request_fake if _USE_FAKE_ENV else _tessie_request_live
+
+
+def refresh() -> None:
+    """Re-read env configuration and rebind tessieRequest to match."""
+
+    global tessieRequest
+    refresh_env()
+    tessieRequest = _tessie_request_fake if _USE_FAKE_ENV else _tessie_request_live
+
+
+def tessie_request_sync(
+    method: str,
+    path: str,
+    api_key: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Synchronous twin of tessieRequest for fake mode only.
+
+    The async entry points already return canned data as their first
+    statement, but every call still allocates a coroutine frame just to do
+    so. Sync callers (and tight test loops) can use this to skip that
+    entirely. Live requests need the event loop, so calling this when fake
+    mode does not apply raises RuntimeError.
+    """
+
+    if not (_USE_FAKE_ENV or api_key == _FAKE_KEY):
+        raise RuntimeError(
+            "tessie_request_sync only serves fake responses; "
+            "use tessieRequest for live calls."
+        )
+
+    try:
+        params_key = frozenset(params.items()) if params else None
+    except TypeError:
+        return get_fake_response(path, params=params)
+    return copy.copy(_cached_fake(path, params_key, cache_generation()))
@@ -0,0 +1,71 @@
+"""Shared fixtures for the Python worker unit tests."""
+
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from tessie_client import UnifiedTessieClient
+
+try:  # faster event loop for the async tests where available
+    import uvloop
+except ImportError:  # pragma: no cover - optional accelerator
+    uvloop = None
+
+if uvloop is not None:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+class TransportRouter:
+    """Programmable handler for httpx.MockTransport.
+
+    Tests assign .response (an httpx.Response) before calling a client
+    method; requests then run through httpx's real request/response path
+    over an in-memory transport, with no sockets and no Mock machinery.
+    The .calls counter backs the few call-count assertions.
+    """
+
+    __slots__ = ("response", "calls")
+
+    def __init__(self):
+        self.response = None
+        self.calls = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        return self.response
+
+    def reset(self):
+        self.response = None
+        self.calls = 0
+
+
+@pytest.fixture(scope="module")
+def router():
+    """Per-module programmable transport handler."""
+    return TransportRouter()
+
+
+@pytest.fixture(scope="module")
+def http_client(router):
+    """Real AsyncClient backed by an in-memory MockTransport."""
+    return httpx.AsyncClient(transport=httpx.MockTransport(router))
+
+
+@pytest_asyncio.fixture(scope="session")
+async def shared_unified():
+    """One fully configured UnifiedTessieClient shared by the whole run.
+
+    Construction spins up an AsyncClient plus three sub-clients, so it is
+    paid once per session; tests needing a different token mix can build a
+    throwaway instance on top of this client's pool.
+    """
+    client = UnifiedTessieClient(
+        tessie_token="tessie_token",
+        telemetry_token="telemetry_token",
+        fleet_token="fleet_token",
+        fleet_region="na",
+    )
+    yield client
+    await client.close()
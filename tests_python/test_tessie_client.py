@@ -1,203 +1,164 @@
-"""
-Unit tests for Tessie Client
-
-Tests the unified client module and all three API wrappers.
-"""
-
-import pytest
-import httpx
-from unittest.mock import AsyncMock, MagicMock, patch
-
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src_python'))
-
-from tessie_client import (
-    UnifiedTessieClient,
-    TessieClient,
-    TeslemetryClient,
-    FleetAPIClient,
-    TessieAPIError
-)
-
-
-@pytest.fixture
-def mock_client():
-    """Create a mock httpx.AsyncClient"""
-    client = AsyncMock(spec=httpx.AsyncClient)
-    client.request = AsyncMock()
-    client.aclose = AsyncMock()
-    return client
-
-
-@pytest.fixture
-def tessie_client(mock_client):
-    """Create TessieClient with mock"""
-    return TessieClient(access_token="test_token", client=mock_client)
-
-
-@pytest.fixture
-def telemetry_client(mock_client):
-    """Create TeslemetryClient with mock"""
-    return TeslemetryClient(access_token="test_token", client=mock_client)
-
-
-@pytest.fixture
-def fleet_client(mock_client):
-    """Create FleetAPIClient with mock"""
-    return FleetAPIClient(access_token="test_token", client=mock_client, region="na")
-
-
-class TestTessieClient:
-    """Test Tessie REST API client"""
-
-    @pytest.mark.asyncio
-    async def test_list_vehicles(self, tessie_client, mock_client):
-        """Test list vehicles endpoint"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"results": [{"vin": "TEST123"}]}
-        mock_client.request.return_value = mock_response
-
-        result = await tessie_client.list_vehicles(only_active=True)
-
-        assert "results" in result
-        assert len(result["results"]) == 1
-        mock_client.request.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_state(self, tessie_client, mock_client):
-        """Test vehicle state endpoint"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"state": "online", "battery_level": 80}
-        mock_client.request.return_value = mock_response
-
-        result = await tessie_client.state("TEST123")
-
-        assert "state" in result
-        assert result["battery_level"] == 80
-
-    @pytest.mark.asyncio
-    async def test_start_charging(self, tessie_client, mock_client):
-        """Test start charging command"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"result": True}
-        mock_client.request.return_value = mock_response
-
-        result = await tessie_client.start_charging("TEST123")
-
-        assert result["result"] is True
-
-    @pytest.mark.asyncio
-    async def test_api_error(self, tessie_client, mock_client):
-        """Test API error handling"""
-        mock_response = MagicMock()
-        mock_response.status_code = 401
-        mock_response.text = "Unauthorized"
-        mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Unauthorized", request=MagicMock(), response=mock_response
-        )
-        mock_client.request.return_value = mock_response
-
-        with pytest.raises(TessieAPIError) as exc_info:
-            await tessie_client.list_vehicles()
-
-        assert exc_info.value.status_code == 401
-
-
-class TestTeslemetryClient:
-    """Test Teslemetry API client"""
-
-    @pytest.mark.asyncio
-    async def test_ping(self, telemetry_client, mock_client):
-        """Test ping endpoint"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"status": "ok"}
-        mock_client.request.return_value = mock_response
-
-        result = await telemetry_client.ping()
-
-        assert result["status"] == "ok"
-
-    @pytest.mark.asyncio
-    async def test_metadata(self, telemetry_client, mock_client):
-        """Test metadata endpoint"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"scopes": ["vehicle_device_data"]}
-        mock_client.request.return_value = mock_response
-
-        result = await telemetry_client.metadata()
-
-        assert "scopes" in result
-
-
-class TestFleetAPIClient:
-    """Test Tesla Fleet API client"""
-
-    @pytest.mark.asyncio
-    async def test_list_vehicles(self, fleet_client, mock_client):
-        """Test list vehicles endpoint"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"response": [{"vin": "5YJ3E1EA1KF000001"}]}
-        mock_client.request.return_value = mock_response
-
-        result = await fleet_client.list_vehicles()
-
-        assert "response" in result
-        assert len(result["response"]) == 1
-
-    @pytest.mark.asyncio
-    async def test_wake_up(self, fleet_client, mock_client):
-        """Test wake up command"""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"response": {"state": "online"}}
-        mock_client.request.return_value = mock_response
-
-        result = await fleet_client.wake_up("5YJ3E1EA1KF000001")
-
-        assert "response" in result
-
-
-class TestUnifiedTessieClient:
-    """Test unified client"""
-
-    @pytest.mark.asyncio
-    async def test_initialization(self):
-        """Test client initialization"""
-        client = UnifiedTessieClient(
-            tessie_token="tessie_token",
-            telemetry_token="telemetry_token",
-            fleet_token="fleet_token",
-            fleet_region="na"
-        )
-
-        assert client.tessie is not None
-        assert client.telemetry is not None
-        assert client.fleet is not None
-
-        await client.close()
-
-    @pytest.mark.asyncio
-    async def test_partial_initialization(self):
-        """Test client with only some tokens"""
-        client = UnifiedTessieClient(
-            tessie_token="tessie_token"
-        )
-
-        assert client.tessie is not None
-        assert client.telemetry is None
-        assert client.fleet is None
-
-        await client.close()
-
-    @pytest.mark.asyncio
-    async def test_context_manager(self):
-        """Test async context manager"""
-        async with UnifiedTessieClient(tessie_token="test") as client:
-            assert client.tessie is not None
+"""
+Unit tests for Tessie Client
+
+Tests the unified client module and all three API wrappers.
+"""
+
+import pytest
+import httpx
+
+from tessie_client import (
+    UnifiedTessieClient,
+    TessieClient,
+    TeslemetryClient,
+    FleetAPIClient,
+    TessieAPIError
+)
+
+
+@pytest.fixture(scope="module")
+def tessie_client(http_client):
+    """Create TessieClient over the in-memory transport"""
+    return TessieClient(access_token="test_token", client=http_client)
+
+
+@pytest.fixture(scope="module")
+def telemetry_client(http_client):
+    """Create TeslemetryClient over the in-memory transport"""
+    return TeslemetryClient(access_token="test_token", client=http_client)
+
+
+@pytest.fixture(scope="module")
+def fleet_client(http_client):
+    """Create FleetAPIClient over the in-memory transport"""
+    return FleetAPIClient(access_token="test_token", client=http_client, region="na")
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_state(router, tessie_client, telemetry_client, fleet_client):
+    """Reset the transport router and client caches after each test."""
+    yield
+    router.reset()
+    tessie_client.invalidate_cache()
+    telemetry_client.invalidate_cache()
+    fleet_client.invalidate_cache()
+
+
+class TestTessieClient:
+    """Test Tessie REST API client"""
+
+    async def test_list_vehicles(self, tessie_client, router):
+        """Test list vehicles endpoint"""
+        router.response = httpx.Response(200, json={"results": [{"vin": "TEST123"}]})
+
+        result = await tessie_client.list_vehicles(only_active=True)
+
+        assert "results" in result
+        assert len(result["results"]) == 1
+        assert router.calls == 1
+
+    async def test_state(self, tessie_client, router):
+        """Test vehicle state endpoint"""
+        router.response = httpx.Response(200, json={"state": "online", "battery_level": 80})
+
+        result = await tessie_client.state("TEST123")
+
+        assert "state" in result
+        assert result["battery_level"] == 80
+
+    async def test_batch_state(self, tessie_client, router):
+        """Test concurrent multi-VIN state fan-out"""
+        router.response = httpx.Response(200, json={"state": "online"})
+
+        result = await tessie_client.batch_state(["VIN1", "VIN2"])
+
+        assert set(result) == {"VIN1", "VIN2"}
+        assert result["VIN1"] == {"state": "online"}
+        assert router.calls == 2
+
+    async def test_start_charging(self, tessie_client, router):
+        """Test start charging command"""
+        router.response = httpx.Response(200, json={"result": True})
+
+        result = await tessie_client.start_charging("TEST123")
+
+        assert result["result"] is True
+
+    async def test_api_error(self, tessie_client, router):
+        """Test API error handling"""
+        router.response = httpx.Response(401, text="Unauthorized")
+
+        with pytest.raises(TessieAPIError) as exc_info:
+            await tessie_client.list_vehicles()
+
+        assert exc_info.value.status_code == 401
+
+
+class TestTeslemetryClient:
+    """Test Teslemetry API client"""
+
+    async def test_ping(self, telemetry_client, router):
+        """Test ping endpoint"""
+        router.response = httpx.Response(200, json={"status": "ok"})
+
+        result = await telemetry_client.ping()
+
+        assert result["status"] == "ok"
+
+    async def test_metadata(self, telemetry_client, router):
+        """Test metadata endpoint"""
+        router.response = httpx.Response(200, json={"scopes": ["vehicle_device_data"]})
+
+        result = await telemetry_client.metadata()
+
+        assert "scopes" in result
+
+
+class TestFleetAPIClient:
+    """Test Tesla Fleet API client"""
+
+    async def test_list_vehicles(self, fleet_client, router):
+        """Test list vehicles endpoint"""
+        router.response = httpx.Response(200, json={"response": [{"vin": "5YJ3E1EA1KF000001"}]})
+
+        result = await fleet_client.list_vehicles()
+
+        assert "response" in result
+        assert len(result["response"]) == 1
+
+    async def test_wake_up(self, fleet_client, router):
+        """Test wake up command"""
+        router.response = httpx.Response(200, json={"response": {"state": "online"}})
+
+        result = await fleet_client.wake_up("5YJ3E1EA1KF000001")
+
+        assert "response" in result
+
+
+class TestUnifiedTessieClient:
+    """Test unified client"""
+
+    async def test_initialization(self, shared_unified):
+        """Test client initialization"""
+        assert shared_unified.tessie is not None
+        assert shared_unified.telemetry is not None
+        assert shared_unified.fleet is not None
+
+    async def test_partial_initialization(self, shared_unified):
+        """Test client with only some tokens"""
+        # Borrow the shared pool: no new AsyncClient, nothing to close.
+        client = UnifiedTessieClient(
+            tessie_token="tessie_token",
+            client=shared_unified.client
+        )
+
+        assert client.tessie is not None
+        assert client.telemetry is None
+        assert client.fleet is None
+
+    async def test_context_manager(self, shared_unified):
+        """Test async context manager"""
+        async with UnifiedTessieClient(
+            tessie_token="test", client=shared_unified.client
+        ) as client:
+            assert client.tessie is not None